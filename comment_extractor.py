@@ -1,10 +1,10 @@
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+import re
 import zipfile
 import logging
-from typing import Dict, List, Optional
-from docx.api import Document
-from xml.etree import ElementTree
+from typing import Dict, Iterable, Iterator, List, Optional
 from setting import (
     ESSAY_PROMPT_KEY,
     ESSAY_TEXT_KEY,
@@ -19,10 +19,85 @@ from setting import (
     DATE_KEY,
 )
 
+try:
+    # lxml parses in C and can filter iterparse events by tag
+    from lxml import etree as ET
+
+    HAS_LXML = True
+    XmlElement = ET._Element
+    # OOXML parts never use DTDs, entities, comments or processing
+    # instructions; huge_tree lifts libxml2's limits for very large documents
+    _PARSER_OPTIONS = dict(
+        huge_tree=True,
+        resolve_entities=False,
+        no_network=True,
+        remove_comments=True,
+        remove_pis=True,
+    )
+    _XML_PARSER = ET.XMLParser(**_PARSER_OPTIONS)
+except ImportError:
+    from xml.etree import ElementTree as ET
+
+    HAS_LXML = False
+    XmlElement = ET.Element
+    _PARSER_OPTIONS = {}
+    _XML_PARSER = None
+
 logger = logging.getLogger(__name__)
 
+_LEADING_WS_RE = re.compile(r"\s*")
+
+# WordprocessingML namespaces
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_W14 = "http://schemas.microsoft.com/office/word/2010/wordml"
+_W15 = "http://schemas.microsoft.com/office/word/2012/wordml"
+
+# Qualified tag and attribute names, built once at import time
+TAG_COMMENT_RANGE_START = f"{{{_W}}}commentRangeStart"
+TAG_COMMENT_RANGE_END = f"{{{_W}}}commentRangeEnd"
+TAG_BODY = f"{{{_W}}}body"
+TAG_T = f"{{{_W}}}t"
+TAG_P = f"{{{_W}}}p"
+TAG_R = f"{{{_W}}}r"
+TAG_HYPERLINK = f"{{{_W}}}hyperlink"
+TAG_BR = f"{{{_W}}}br"
+TAG_CR = f"{{{_W}}}cr"
+TAG_TAB = f"{{{_W}}}tab"
+TAG_PTAB = f"{{{_W}}}ptab"
+TAG_NO_BREAK_HYPHEN = f"{{{_W}}}noBreakHyphen"
+TAG_COMMENT = f"{{{_W}}}comment"
+TAG_TBL = f"{{{_W}}}tbl"
+TAG_TR = f"{{{_W}}}tr"
+TAG_TC = f"{{{_W}}}tc"
+TAG_TR_PR = f"{{{_W}}}trPr"
+TAG_TC_PR = f"{{{_W}}}tcPr"
+TAG_GRID_BEFORE = f"{{{_W}}}gridBefore"
+TAG_GRID_SPAN = f"{{{_W}}}gridSpan"
+TAG_V_MERGE = f"{{{_W}}}vMerge"
+TAG_COMMENT_EX = f"{{{_W15}}}commentEx"
+ATTR_W_ID = f"{{{_W}}}id"
+ATTR_W_AUTHOR = f"{{{_W}}}author"
+ATTR_W_DATE = f"{{{_W}}}date"
+ATTR_W_VAL = f"{{{_W}}}val"
+ATTR_W_TYPE = f"{{{_W}}}type"
+ATTR_W14_PARA_ID = f"{{{_W14}}}paraId"
+ATTR_W15_PARA_ID = f"{{{_W15}}}paraId"
+ATTR_W15_PARA_ID_PARENT = f"{{{_W15}}}paraIdParent"
+
+# Tags handled while streaming document.xml
+_DOCUMENT_TAGS = (
+    TAG_COMMENT_RANGE_START,
+    TAG_COMMENT_RANGE_END,
+    TAG_T,
+    TAG_P,
+    TAG_BR,
+    TAG_TBL,
+    TAG_BODY,
+)
+_DOCUMENT_TAG_SET = frozenset(_DOCUMENT_TAGS)
+
 
-@dataclass
+@dataclass(slots=True)
 class Comment:
     id: str
     para_id: str
@@ -52,33 +127,58 @@ class Comment:
 
 
 class HighlightRange:
-    """Highlight range with relative start position."""
+    """
+    Highlight range with relative start position.
+    Only offsets into the document text are stored, the highlighted text
+    itself is sliced out of the full text on demand.
+    """
+
+    __slots__ = ("comment_id", "absolute_start", "absolute_end", "section_start")
 
     def __init__(self, comment_id: str, absolute_start: int):
         self.comment_id = comment_id
         self.absolute_start = absolute_start
+        # None while the range is open, i.e. it runs to the end of the document
+        self.absolute_end: Optional[int] = None
         self.section_start = 0
-        self.texts: List[str] = []
-
-    def append(self, text: str):
-        self.texts.append(text)
 
-    def get_text(self) -> str:
-        return "".join(self.texts)
+    def get_text(self, full_text: str) -> str:
+        return full_text[self.absolute_start : self.absolute_end]
 
     def get_relative_start(self) -> int:
         return self.absolute_start - self.section_start
 
 
-@dataclass
+@dataclass(slots=True)
 class Section:
     start: int
     end: int
-    raw_text: str
     stripped_text: str
 
 
+@dataclass(slots=True)
+class DocxContent:
+    """Parts of a Word document gathered in a single read of the file."""
+
+    comments_root: Optional[XmlElement] = None
+    # commentsExtended.xml is kept unparsed, most documents have no replies
+    comments_extend_raw: Optional[bytes] = None
+    comment_id_to_range: Dict[str, HighlightRange] = field(default_factory=dict)
+    full_text: str = ""
+    # Cell texts of the first table, None if the document has no table
+    table_rows: Optional[List[List[str]]] = None
+
+
 class ExtractConfig:
+    __slots__ = (
+        "prompt_start_token",
+        "prompt_end_token",
+        "fb_start_token",
+        "fb_end_token",
+        "include_author",
+        "include_date",
+    )
+
     def __init__(
         self, 
         prompt_start_token=None,
@@ -96,14 +196,101 @@ class ExtractConfig:
         self.include_date = include_date
 
 
+def _cell_text(tc, new_line: str) -> str:
+    """
+    Text of a table cell, its paragraphs joined by new lines. As in
+    python-docx, only runs placed directly in a paragraph or in one of its
+    hyperlinks are read, so tracked insertions, content controls and text
+    boxes inside the cell are left out.
+    """
+    paragraphs = []
+    for p in tc.iterfind(TAG_P):
+        parts = []
+        for child in p:
+            if child.tag == TAG_R:
+                runs = (child,)
+            elif child.tag == TAG_HYPERLINK:
+                runs = child.iterfind(TAG_R)
+            else:
+                continue
+            for r in runs:
+                for node in r:
+                    tag = node.tag
+                    if tag == TAG_T:
+                        if node.text:
+                            parts.append(node.text)
+                    elif tag == TAG_TAB or tag == TAG_PTAB:
+                        parts.append("\t")
+                    elif tag == TAG_NO_BREAK_HYPHEN:
+                        parts.append("-")
+                    elif tag == TAG_CR or (
+                        # Page and column breaks carry no text
+                        tag == TAG_BR
+                        and node.get(ATTR_W_TYPE, "textWrapping") == "textWrapping"
+                    ):
+                        parts.append(new_line)
+        paragraphs.append("".join(parts))
+    return new_line.join(paragraphs)
+
+
+def extract_table_rows(tbl, new_line: str = "\n") -> List[List[str]]:
+    """
+    Extract the cell texts of a table, row by row, the way python-docx
+    reads ``row.cells``. A cell spanning several grid columns is repeated
+    once per column and a vertically merged cell repeats the text of the
+    cell it continues. Grid columns skipped by ``w:gridBefore`` still count
+    when lining a cell up with the row above.
+    """
+    rows = []
+    # Cells of the previous row by the grid column they start at
+    above = {}
+    for tr in tbl.iterfind(TAG_TR):
+        cells = []
+        starts = {}
+        offset = 0
+        tr_pr = tr.find(TAG_TR_PR)
+        if tr_pr is not None:
+            grid_before = tr_pr.find(TAG_GRID_BEFORE)
+            if grid_before is not None:
+                offset = int(grid_before.get(ATTR_W_VAL, 0))
+        for tc in tr.iterfind(TAG_TC):
+            span = 1
+            merged = None
+            tc_pr = tc.find(TAG_TC_PR)
+            if tc_pr is not None:
+                grid_span = tc_pr.find(TAG_GRID_SPAN)
+                if grid_span is not None:
+                    span = int(grid_span.get(ATTR_W_VAL, 1))
+                v_merge = tc_pr.find(TAG_V_MERGE)
+                if (
+                    v_merge is not None
+                    and v_merge.get(ATTR_W_VAL, "continue") == "continue"
+                ):
+                    merged = above.get(offset)
+            if merged is None:
+                merged = [_cell_text(tc, new_line)] * span
+            starts[offset] = merged
+            cells.extend(merged)
+            offset += span
+        above = starts
+        rows.append(cells)
+    return rows
+
+
+def _is_child(parent, elem) -> bool:
+    """Whether elem is a direct child of parent."""
+    if parent is None:
+        return False
+    if HAS_LXML:
+        return elem.getparent() is parent
+    # ElementTree keeps no parent links. The parser only reads ahead past
+    # elem, so a direct child is found quickly from the end.
+    return any(child is elem for child in reversed(parent))
+
+
 class CommentExtractor:
     def __init__(self, config: ExtractConfig = None):
         self.config = config or ExtractConfig()
-        self.namespaces = {
-            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
-            "w14": "http://schemas.microsoft.com/office/word/2010/wordml",
-            "w15": "http://schemas.microsoft.com/office/word/2012/wordml",
-        }
         self.new_line = "\n"
 
     def extract_text_between_tokens(self, text: str, start_token: str|None, end_token: str|None) -> Section:
@@ -130,129 +317,240 @@ class CommentExtractor:
             else:
                 end_idx = end_token_pos
 
-        raw_text = text[start_idx:end_idx]
-        lstripped_text = raw_text.lstrip()
-        stripped_text = lstripped_text.rstrip()
-        blank_chars_before_start_token = len(raw_text) - len(lstripped_text)
-        blank_chars_before_end_token = len(lstripped_text) - len(stripped_text)
-
-        return Section(
-            start=start_idx + blank_chars_before_start_token,
-            end=end_idx - blank_chars_before_end_token,
-            raw_text=raw_text,
-            stripped_text=stripped_text,
-        )
-
-    def _read_docx_file(
-        self, file_path: str
-    ) -> tuple[ElementTree.Element, ElementTree.Element, ElementTree.Element]:
+        # Skip surrounding blanks in place, so that only the stripped
+        # section is copied out of the full text
+        start = _LEADING_WS_RE.match(text, start_idx, end_idx).end()
+        end = end_idx
+        while end > start and text[end - 1].isspace():
+            end -= 1
+
+        return Section(start=start, end=end, stripped_text=text[start:end])
+
+    def _read_docx_file(self, file_path: str) -> DocxContent:
+        """
+        Read the comment parts and stream the document body of a Word file.
+        The zip is opened once per document.
+        """
+        content = DocxContent()
         try:
             with zipfile.ZipFile(file_path) as zip_ref:
                 # Read XML files
-                comments_root = self._read_xml_files(zip_ref, "word/comments.xml")
-                comments_extend_root = self._read_xml_files(
+                content.comments_root = self._read_xml_files(
+                    zip_ref, "word/comments.xml"
+                )
+                content.comments_extend_raw = self._read_raw_file(
                     zip_ref, "word/commentsExtended.xml"
                 )
-                doc_root = self._read_xml_files(zip_ref, "word/document.xml")
-                return comments_root, comments_extend_root, doc_root
+                # document.xml can be large, so it is parsed while it is read
+                doc_stream = self._open_xml_file(zip_ref, "word/document.xml")
+                if doc_stream is None:
+                    return content
+                with doc_stream:
+                    (
+                        content.comment_id_to_range,
+                        content.full_text,
+                        content.table_rows,
+                    ) = self._extract_highlight_ranges(doc_stream)
         except zipfile.BadZipFile as e:
             logger.error("Error reading %s: %s", file_path, str(e))
-            return None, None, None
+        return content
+
+    def _open_xml_file(self, zip_ref, inner_file_name: str):
+        """Open an XML file from the Word document as a binary stream."""
+        try:
+            return zip_ref.open(inner_file_name)
+        except KeyError:
+            logger.warning(
+                f"XML file {inner_file_name} not found in document {zip_ref.filename}"
+            )
+            return None
 
-    def _read_xml_files(self, zip_ref, inner_file_name: str) -> ElementTree.Element:
-        """Read and parse XML files from the Word document."""
+    def _read_raw_file(self, zip_ref, inner_file_name: str) -> Optional[bytes]:
+        """Read the raw bytes of an XML file from the Word document."""
         try:
-            xml = zip_ref.read(inner_file_name)
+            return zip_ref.read(inner_file_name)
         except KeyError:
             logger.warning(
                 f"XML file {inner_file_name} not found in document {zip_ref.filename}"
             )
             return None
-        return ElementTree.fromstring(xml)
 
-    def _extract_highlight_ranges(self, doc_root) -> Dict[str, HighlightRange]:
-        """Extract comment ranges and their corresponding text from document with position info."""
-        current_range_ids = []
+    def _read_xml_files(self, zip_ref, inner_file_name: str) -> XmlElement:
+        """Parse an XML file from the Word document while it is decompressed."""
+        stream = self._open_xml_file(zip_ref, inner_file_name)
+        if stream is None:
+            return None
+        with stream:
+            return ET.parse(stream, _XML_PARSER).getroot()
+
+    def _iterparse_document(self, doc_stream):
+        """Iterate over start/end events of document.xml."""
+        events = ("start", "end")
+        if HAS_LXML:
+            # Only the tags handled by _extract_highlight_ranges reach Python
+            return ET.iterparse(
+                doc_stream, events=events, tag=_DOCUMENT_TAGS, **_PARSER_OPTIONS
+            )
+        return ET.iterparse(doc_stream, events=events)
+
+    def _extract_highlight_ranges(
+        self, doc_stream
+    ) -> tuple[Dict[str, HighlightRange], str, Optional[List[List[str]]]]:
+        """
+        Extract comment ranges and their corresponding text from document with position info.
+        The XML is stream-parsed and each element is cleared once handled,
+        so the document tree is never fully held in memory. The first table
+        placed directly in the body is kept until it is closed so that its
+        cell texts can be returned too.
+        """
         comment_id_to_range = {}
-        full_text = ""
+        full_text_parts: List[str] = []
+        text_len = 0
         is_first_paragraph = True
+        table_depth = 0
+        table_rows = None
+        body = None
+
+        if doc_stream is None:
+            return comment_id_to_range, "", table_rows
+
+        tag_crs = TAG_COMMENT_RANGE_START
+        tag_cre = TAG_COMMENT_RANGE_END
+        tag_t = TAG_T
+        tag_p = TAG_P
+        tag_br = TAG_BR
+        tag_tbl = TAG_TBL
+        tag_body = TAG_BODY
+        attr_id = ATTR_W_ID
+        document_tags = _DOCUMENT_TAG_SET
+        has_lxml = HAS_LXML
+
+        for event, elem in self._iterparse_document(doc_stream):
+            tag = elem.tag
+            if tag not in document_tags:
+                # Only reached without lxml's tag filter. A single hash lookup
+                # skips the compare ladder; the element is cleared together
+                # with its enclosing paragraph or table.
+                continue
+            if event == "start":
+                # Paragraph breaks must be emitted before the paragraph content.
+                # Everything else is handled on "end", when elem.text is complete.
+                if tag == tag_p:
+                    if is_first_paragraph:
+                        is_first_paragraph = False
+                    else:
+                        # Add new line, if not the first paragraph
+                        full_text_parts.append(self.new_line)
+                        text_len += len(self.new_line)
+                elif tag == tag_tbl:
+                    table_depth += 1
+                elif tag == tag_body:
+                    body = elem
+                continue
 
-        if doc_root is None:
-            return comment_id_to_range, full_text
-
-        for elem in doc_root.iter():
-            if elem.tag == f"{{{self.namespaces['w']}}}commentRangeStart":
-                comment_id = elem.get(f"{{{self.namespaces['w']}}}id")
-                current_range_ids.append(comment_id)
-                hr = HighlightRange(
-                    comment_id=comment_id, absolute_start=len(full_text)
-                )
+            # Text runs far outnumber the other tags, so they are tested first.
+            # Paragraph ends match no branch and only go on to be cleared.
+            if tag == tag_t:
+                text = elem.text
+                if text:
+                    full_text_parts.append(text)
+                    text_len += len(text)
+            elif tag == tag_crs:
+                comment_id = elem.get(attr_id)
+                hr = HighlightRange(comment_id=comment_id, absolute_start=text_len)
                 comment_id_to_range[comment_id] = hr
-            elif elem.tag == f"{{{self.namespaces['w']}}}commentRangeEnd":
-                comment_id = elem.get(f"{{{self.namespaces['w']}}}id")
-                if comment_id in comment_id_to_range:
-                    current_range_ids.remove(comment_id)
-            elif elem.tag == f"{{{self.namespaces['w']}}}t":
-                if elem.text:
-                    for comment_id in current_range_ids:
-                        hr = comment_id_to_range[comment_id]
-                        hr.append(elem.text)
-                    full_text += elem.text
-            elif elem.tag == f"{{{self.namespaces['w']}}}p":
-                if is_first_paragraph:
-                    is_first_paragraph = False
-                else:
-                    # Add new line to all highlight ranges, if not the first paragraph
-                    full_text += self.new_line
-                    for comment_id in current_range_ids:
-                        hr = comment_id_to_range[comment_id]
-                        hr.append(self.new_line)
-            elif elem.tag == f"{{{self.namespaces['w']}}}br":
-                full_text += self.new_line
-                for comment_id in current_range_ids:
-                    hr = comment_id_to_range[comment_id]
-                    hr.append(self.new_line)
-
-        return comment_id_to_range, full_text
-
-    def _get_sub_comments(self, comments_extend_root) -> set[str]:
+            elif tag == tag_cre:
+                hr = comment_id_to_range.get(elem.get(attr_id))
+                if hr is not None and hr.absolute_end is None:
+                    hr.absolute_end = text_len
+            elif tag == tag_br:
+                full_text_parts.append(self.new_line)
+                text_len += len(self.new_line)
+            elif tag == tag_tbl:
+                table_depth -= 1
+                # Like python-docx's document.tables, a table in a text box
+                # or a content control does not count
+                if table_depth == 0 and table_rows is None and _is_child(body, elem):
+                    table_rows = extract_table_rows(elem, self.new_line)
+
+            # Keep the first table intact until its rows have been read
+            if table_rows is not None or table_depth == 0:
+                elem.clear()
+                if tag == tag_p or tag == tag_tbl:
+                    # Drop the already cleared siblings too, otherwise every
+                    # paragraph leaves an empty element behind in the body.
+                    # Runs are emptied along with their paragraph.
+                    if has_lxml:
+                        while elem.getprevious() is not None:
+                            del elem.getparent()[0]
+                    elif _is_child(body, elem):
+                        # ElementTree has no sibling links, so each finished
+                        # body paragraph or table removes itself instead
+                        body.remove(elem)
+
+        return comment_id_to_range, "".join(full_text_parts), table_rows
+
+    def _get_sub_comments(self, comments_extend_raw: Optional[bytes]) -> set[str]:
         """Get set of paragraph IDs that are replies to other comments."""
         sub_comments = set()
-        if comments_extend_root is None:
+        # Without any paraIdParent attribute there are no replies to find,
+        # so skip parsing the file altogether
+        if comments_extend_raw is None or b"paraIdParent" not in comments_extend_raw:
             return sub_comments
-        for comment_ex in comments_extend_root.findall(
-            ".//w15:commentEx", self.namespaces
-        ):
-            para_id = comment_ex.get(f"{{{self.namespaces['w15']}}}paraId")
-            parent_para_id = comment_ex.get(
-                f"{{{self.namespaces['w15']}}}paraIdParent", None
-            )
+        comments_extend_root = ET.fromstring(comments_extend_raw, _XML_PARSER)
+        attr_para_id = ATTR_W15_PARA_ID
+        attr_para_id_parent = ATTR_W15_PARA_ID_PARENT
+        for comment_ex in comments_extend_root.iter(TAG_COMMENT_EX):
+            para_id = comment_ex.get(attr_para_id)
+            parent_para_id = comment_ex.get(attr_para_id_parent, None)
             if parent_para_id is not None:
                 sub_comments.add(para_id)
         return sub_comments
 
-    def _extract_comment_text(self, comment_node) -> str:
-        """Extract text from a comment node."""
+    def _scan_comment_node(
+        self, comment_node
+    ) -> tuple[Optional[XmlElement], str]:
+        """
+        Walk a comment node once and return its first paragraph and its text.
+        The paragraph is None if the comment has no paragraph.
+        """
+        tag_p = TAG_P
+        tag_t = TAG_T
+        para = None
         comment_text = []
-        for p in comment_node.findall(".//w:t", self.namespaces):
-            if p.text:
-                comment_text.append(p.text)
-        return " ".join(comment_text)
+        if HAS_LXML:
+            # lxml filters by tag in C, so runs and properties are never seen
+            elems = comment_node.iter(tag_t, tag_p)
+        else:
+            elems = comment_node.iter()
+        for elem in elems:
+            tag = elem.tag
+            if tag == tag_t:
+                text = elem.text
+                if text:
+                    comment_text.append(text)
+            elif tag == tag_p and para is None:
+                para = elem
+        return para, " ".join(comment_text)
 
     def _extract_comments(
-        self, comments_root, comment_id_to_range, section_start, sub_comments
+        self, comments_root, comment_id_to_range, full_text, section_start, sub_comments
     ) -> List[Dict]:
         # Process main comments
         comments = []
+        include_author = self.config.include_author
+        include_date = self.config.include_date
+        # Fallback for comments without a date, computed once on first use
+        default_date = None
 
-        for comment_node in comments_root.findall(".//w:comment", self.namespaces):
-            comment_id = comment_node.get(f"{{{self.namespaces['w']}}}id")
-            para = comment_node.find(".//w:p", self.namespaces)
+        for comment_node in comments_root.iter(TAG_COMMENT):
+            comment_id = comment_node.get(ATTR_W_ID)
+            para, comment_text = self._scan_comment_node(comment_node)
 
             if para is None:
                 continue
 
-            para_id = para.get(f"{{{self.namespaces['w14']}}}paraId")
+            para_id = para.get(ATTR_W14_PARA_ID)
             if para_id in sub_comments:
                 continue  # Skip reply comments
 
@@ -272,31 +570,41 @@ class CommentExtractor:
                 )
                 continue
 
+            # Author and date are only looked up when they are emitted
+            author = comment_node.get(ATTR_W_AUTHOR, "") if include_author else ""
+            date = comment_node.get(ATTR_W_DATE) if include_date else ""
+            if date is None:
+                if default_date is None:
+                    default_date = datetime.now().isoformat()
+                date = default_date
+
+            highlighted_text = highlighted_range.get_text(full_text)
             comment = Comment(
                 id=int(comment_id),
                 para_id=para_id,
                 para_id_parent=None,
-                author=comment_node.get(f"{{{self.namespaces['w']}}}author", ""),
-                date=comment_node.get(
-                    f"{{{self.namespaces['w']}}}date", datetime.now().isoformat()
-                ),
-                comment_text=self._extract_comment_text(comment_node),
-                highlighted_text=highlighted_range.get_text(),
+                author=author,
+                date=date,
+                comment_text=comment_text,
+                highlighted_text=highlighted_text,
                 start=pos,
-                end=pos + len(highlighted_range.get_text()),
-            )
-            comments.append(
-                comment.get_dict(self.config.include_author, self.config.include_date)
+                end=pos + len(highlighted_text),
             )
+            comments.append(comment.get_dict(include_author, include_date))
         return comments
 
     def extract_comments_from_docx(self, docx_path: str) -> tuple[List[Dict], Section, Section]:
         """Extract comments directly from the Word document's XML structure."""
-        # Read XML files
-        comments_root, comments_extend_root, doc_root = self._read_docx_file(docx_path)
+        return self._extract_document_comments(self._read_docx_file(docx_path))
 
-        # Extract comment ranges and their text
-        comment_id_to_range, full_text = self._extract_highlight_ranges(doc_root)
+    def _extract_document_comments(
+        self, content: DocxContent
+    ) -> tuple[List[Dict], Section, Section]:
+        """Extract comments and the token sections from an already read document."""
+        comments_root = content.comments_root
+        comments_extend_raw = content.comments_extend_raw
+        comment_id_to_range = content.comment_id_to_range
+        full_text = content.full_text
 
         fb_section = self.extract_text_between_tokens(full_text, self.config.fb_start_token, self.config.fb_end_token)
         section_start = fb_section.start
@@ -304,22 +612,33 @@ class CommentExtractor:
         prompt_section = self.extract_text_between_tokens(full_text, self.config.prompt_start_token, self.config.prompt_end_token)
         prompt_start = prompt_section.start
 
-        # Get sub-comments (replies)
-        sub_comments = self._get_sub_comments(comments_extend_root)
-
         comments = []
         if comments_root is None:
             logger.warning("Skip document. No comments found")
+        elif not comment_id_to_range:
+            # Every comment needs a highlighted range, none can be extracted
+            logger.warning("Skip document. No highlighted text found for any comment")
         else:
+            # Get sub-comments (replies)
+            sub_comments = self._get_sub_comments(comments_extend_raw)
+
             # Extract comments
             comments = self._extract_comments(
-                comments_root, comment_id_to_range, section_start, sub_comments
+                comments_root,
+                comment_id_to_range,
+                full_text,
+                section_start,
+                sub_comments,
             )
 
         return comments, fb_section, prompt_section
     
     def extract_table(self, input_file: str) -> List[Dict]:
         """Extract table from the document."""
+        return self._table_rows_to_dicts(self._read_docx_file(input_file).table_rows)
+
+    def _table_rows_to_dicts(self, table_rows: Optional[List[List[str]]]) -> List[Dict]:
+        """Convert table rows to dicts keyed by the header row."""
         name_mapping = {
             "Item": "item",
             "Evaluation": "evaluation",
@@ -327,17 +646,15 @@ class CommentExtractor:
         }
         data = []
 
-        document = Document(input_file)
-        if len(document.tables) == 0:
+        if table_rows is None:
             logger.error("No table found in the document")
             return data
-        table = document.tables[0]
         keys = None
-        for i, row in enumerate(table.rows):
-            text = (cell.text.strip() for cell in row.cells)
+        for i, row in enumerate(table_rows):
+            text = (cell.strip() for cell in row)
 
             if i == 0:
-                keys = tuple(name_mapping.get(cell.text.strip(), cell.text.strip()) for cell in row.cells)
+                keys = tuple(name_mapping.get(cell, cell) for cell in text)
                 continue
             row_data = dict(zip(keys, text))
             data.append(row_data)
@@ -347,9 +664,10 @@ class CommentExtractor:
         """Process a single document and return the JSON structure."""
         result = {ESSAY_PROMPT_KEY: None, ESSAY_TEXT_KEY: None, COMMENTS_KEY: []}
         try:
-            # Process comments
-            comments, fb_section, prompt_section = self.extract_comments_from_docx(file_path)
-            general_feedbacks = self.extract_table(file_path)
+            # Read the document once and reuse it for both comments and table
+            content = self._read_docx_file(file_path)
+            comments, fb_section, prompt_section = self._extract_document_comments(content)
+            general_feedbacks = self._table_rows_to_dicts(content.table_rows)
             prompt_text = prompt_section.stripped_text if prompt_section else ""
             text = fb_section.stripped_text if fb_section else ""
             if not text:
@@ -365,3 +683,33 @@ class CommentExtractor:
         except Exception as e:
             logger.error("Error processing %s: %s", file_path, str(e))
             return result
+
+    def process_documents(
+        self, file_paths: Iterable[str], max_workers: Optional[int] = None
+    ) -> Iterator[tuple[str, dict[str, List[Dict]]]]:
+        """
+        Process documents in parallel worker processes.
+        Yields (file_path, result) pairs in the order of file_paths.
+        """
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(self.config,),
+        ) as executor:
+            # Batch small documents to keep IPC overhead low
+            yield from executor.map(_process_one, file_paths, chunksize=8)
+
+
+# Extractor of a worker process, built once by _init_worker
+_worker_extractor: Optional[CommentExtractor] = None
+
+
+def _init_worker(config: ExtractConfig):
+    """Build the extractor once per worker, so the config is sent only once."""
+    global _worker_extractor
+    _worker_extractor = CommentExtractor(config)
+
+
+def _process_one(file_path: str) -> tuple[str, dict[str, List[Dict]]]:
+    """Process a single document in a worker process."""
+    return file_path, _worker_extractor.process_document(file_path)
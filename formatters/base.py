@@ -1,9 +1,14 @@
 import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import Iterator
 
 
-@dataclass
+# Buffer streamed output so large files are written in few system calls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+@dataclass(slots=True)
 class FormatterConfig:
     extension: str
     output_subfolder: str
@@ -14,26 +19,54 @@ class BaseFormatter(ABC):
 
     def __init__(self, config: FormatterConfig):
         self.config = config
+        # Output directories already created by this formatter
+        self._dirs_made: set[str] = set()
 
     @abstractmethod
     def format(self, data: dict) -> str:
         """Format the data into a string."""
         pass
 
+    def has_output(self, data: dict) -> bool:
+        """Whether the data produces any output worth saving."""
+        return True
+
+    def iter_format(self, data: dict) -> Iterator[str]:
+        """
+        Yield the formatted data in chunks.
+        Formatters that can build their output piecewise override this so
+        save() streams to the file instead of materializing one string.
+        """
+        yield self.format(data)
+
     def save(self, data: dict, base_output_dir: str, filename: str) -> str:
         """
         Save the formatted data to a file.
         Returns the full output path.
         """
-        output_path = self.get_output_path(base_output_dir, filename)
+        output_path = self._prepare_output_path(base_output_dir, filename)
+
+        # Format and stream the data to the file
+        with open(
+            output_path,
+            "w",
+            encoding="utf-8",
+            newline="",
+            buffering=_WRITE_BUFFER_SIZE,
+        ) as f:
+            f.writelines(self.iter_format(data))
 
-        # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        return output_path
+
+    def _prepare_output_path(self, base_output_dir: str, filename: str) -> str:
+        """Construct the output path and ensure its directory exists."""
+        output_path = self.get_output_path(base_output_dir, filename)
 
-        # Format and save the data
-        formatted_data = self.format(data)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(formatted_data)
+        # Create each output directory only once
+        dirpath = os.path.dirname(output_path)
+        if dirpath not in self._dirs_made:
+            os.makedirs(dirpath, exist_ok=True)
+            self._dirs_made.add(dirpath)
 
         return output_path
 
@@ -1,4 +1,5 @@
-from typing import Dict
+from operator import itemgetter
+from typing import Dict, Iterator
 from .base import BaseFormatter
 from setting import (
     ESSAY_TEXT_KEY,
@@ -8,57 +9,8 @@ from setting import (
     COMMENT_TEXT_KEY,
 )
 
-
-class HtmlFormatter(BaseFormatter):
-    """Formatter that converts comment data to HTML with styled tooltips."""
-
-    def format(self, json_data: Dict) -> str:
-        essay_text = json_data[ESSAY_TEXT_KEY]
-        comments = sorted(json_data[COMMENTS_KEY], key=lambda x: x[COMMENT_START_KEY])
-
-        if not essay_text or not comments:
-            return ""
-
-        return self._generate_html(essay_text, comments)
-
-    def _generate_html(self, essay_text: str, comments: list) -> str:
-        html = self._get_html_template()
-        result_text = []
-        current_pos = 0
-
-        for comment in comments:
-            # Add text before the comment
-            result_text.append(
-                self._process_text(essay_text[current_pos : comment[COMMENT_START_KEY]])
-            )
-
-            # Add highlighted text with tooltip
-            highlighted = self._process_text(
-                essay_text[comment[COMMENT_START_KEY] : comment[COMMENT_END_KEY]]
-            )
-            comment_text = self._process_text(comment[COMMENT_TEXT_KEY])
-            result_text.append(
-                f'<span class="highlighted">{highlighted}'
-                f'<span class="tooltip">{comment_text}</span></span>'
-            )
-
-            current_pos = comment[COMMENT_END_KEY]
-
-        # Add remaining text
-        result_text.append(self._process_text(essay_text[current_pos:]))
-
-        # Join all text and close HTML tags
-        html += "".join(result_text)
-        html += "\n</body>\n</html>"
-
-        return html
-
-    def _process_text(self, text: str) -> str:
-        """Convert newlines to <br> tags and escape HTML special characters."""
-        return text.replace("\n", "<br><br>")
-
-    def _get_html_template(self) -> str:
-        return """
+# Page header and footer emitted around the essay body
+_HTML_HEADER = """
         <html>
         <head>
         <style>
@@ -109,3 +61,67 @@ class HtmlFormatter(BaseFormatter):
         </head>
         <body>
         """
+_HTML_FOOTER = "\n</body>\n</html>"
+
+# C-level sort key, no Python frame per comment
+_START_KEY_GETTER = itemgetter(COMMENT_START_KEY)
+
+
+class HtmlFormatter(BaseFormatter):
+    """Formatter that converts comment data to HTML with styled tooltips."""
+
+    def format(self, json_data: Dict) -> str:
+        return "".join(self.iter_format(json_data))
+
+    def has_output(self, json_data: Dict) -> bool:
+        return bool(json_data[ESSAY_TEXT_KEY] and json_data[COMMENTS_KEY])
+
+    def iter_format(self, json_data: Dict) -> Iterator[str]:
+        if not self.has_output(json_data):
+            return
+
+        comments = sorted(json_data[COMMENTS_KEY], key=_START_KEY_GETTER)
+        yield from self._iter_html(json_data[ESSAY_TEXT_KEY], comments)
+
+    def _iter_html(self, essay_text: str, comments: list) -> Iterator[str]:
+        yield _HTML_HEADER
+        process = self._process_text
+        current_pos = 0
+
+        for comment in comments:
+            start = comment[COMMENT_START_KEY]
+            end = comment[COMMENT_END_KEY]
+
+            # Add text before the comment
+            yield process(essay_text[current_pos:start])
+
+            # Add highlighted text with tooltip
+            highlighted = process(essay_text[start:end])
+            comment_text = process(comment[COMMENT_TEXT_KEY])
+            yield (
+                f'<span class="highlighted">{highlighted}'
+                f'<span class="tooltip">{comment_text}</span></span>'
+            )
+
+            current_pos = end
+
+        # Add remaining text and close HTML tags
+        yield process(essay_text[current_pos:])
+        yield _HTML_FOOTER
+
+    def _process_text(self, text: str) -> str:
+        """Convert newlines to <br> tags and escape HTML special characters."""
+        # Most segments contain none of these characters; the C-level
+        # membership test is much cheaper than a replace() that finds nothing.
+        # "&" must be escaped first so the other entities are left intact.
+        if "&" in text:
+            text = text.replace("&", "&amp;")
+        if "<" in text:
+            text = text.replace("<", "&lt;")
+        if ">" in text:
+            text = text.replace(">", "&gt;")
+        if '"' in text:
+            text = text.replace('"', "&quot;")
+        if "\n" in text:
+            text = text.replace("\n", "<br><br>")
+        return text
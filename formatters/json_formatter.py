@@ -1,9 +1,38 @@
-import json
 from typing import Dict, Any
 from .base import BaseFormatter
+from setting import ESSAY_TEXT_KEY, COMMENTS_KEY
+
+try:
+    # orjson serializes in Rust and returns UTF-8 bytes directly
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    import json
+
+    HAS_ORJSON = False
 
 
 class JsonFormatter(BaseFormatter):
+    def has_output(self, data: Dict[str, Any]) -> bool:
+        # Documents that failed to extract have neither text nor comments
+        return data[ESSAY_TEXT_KEY] is not None or bool(data[COMMENTS_KEY])
+
     def format(self, data: Dict[str, Any]) -> str:
         """Convert the data to a JSON string."""
+        if HAS_ORJSON:
+            return self.format_bytes(data).decode("utf-8")
         return json.dumps(data, ensure_ascii=False, indent=2)
+
+    def format_bytes(self, data: Dict[str, Any]) -> bytes:
+        """Convert the data to UTF-8 encoded JSON."""
+        if HAS_ORJSON:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def save(self, data: Dict[str, Any], base_output_dir: str, filename: str) -> str:
+        """Save the data as JSON, writing the encoded bytes directly."""
+        output_path = self._prepare_output_path(base_output_dir, filename)
+        with open(output_path, "wb") as f:
+            f.write(self.format_bytes(data))
+        return output_path
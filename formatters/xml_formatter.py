@@ -8,29 +8,38 @@ from setting import (
     COMMENT_TEXT_KEY,
 )
 
+_END = 0
+_START = 1
+
 
 class XmlFormatter(BaseFormatter):
     """Formatter that converts comment data to XML with inline comment tags."""
 
+    def has_output(self, json_data: Dict) -> bool:
+        return bool(json_data[ESSAY_TEXT_KEY] and json_data[COMMENTS_KEY])
+
     def format(self, json_data: Dict) -> str:
+        if not self.has_output(json_data):
+            return ""
+
         essay_text = json_data[ESSAY_TEXT_KEY]
         comments = json_data[COMMENTS_KEY]
 
-        if not essay_text or not comments:
-            return ""
-
-        # Create a list of all positions where we need to insert tags
+        # Create a list of all positions where we need to insert tags.
+        # Tag types are _END < _START so that plain tuple ordering puts end tags
+        # before start tags at the same position; (pos, type, i) is unique, so
+        # the comment text is never compared.
         positions = []
         for i, comment in enumerate(comments):
             # Add start tag position
             positions.append(
-                (comment[COMMENT_START_KEY], "start", i, comment[COMMENT_TEXT_KEY])
+                (comment[COMMENT_START_KEY], _START, i, comment[COMMENT_TEXT_KEY])
             )
             # Add end tag position
-            positions.append((comment[COMMENT_END_KEY], "end", i, None))
+            positions.append((comment[COMMENT_END_KEY], _END, i, None))
 
-        # Sort positions by index, with end tags coming before start tags at same position
-        positions.sort(key=lambda x: (x[0], 0 if x[1] == "end" else 1))
+        # Sort positions by index using the C tuple comparison, no key function
+        positions.sort()
 
         # Build the XML string
         result = []
@@ -41,7 +50,7 @@ class XmlFormatter(BaseFormatter):
             result.append(essay_text[current_pos:pos])
 
             # Add the tag
-            if tag_type == "start":
+            if tag_type == _START:
                 result.append(
                     f'<comment-start id="{comment_id}" data="{self._escape_xml(comment_text)}"/>'
                 )
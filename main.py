@@ -3,9 +3,76 @@ import argparse
 import logging
 from comment_extractor import CommentExtractor, ExtractConfig
 from formatters.formatter_factory import FormatterFactory
+from setting import COMMENTS_KEY, ESSAY_TEXT_KEY
+
+try:
+    # orjson reads and writes UTF-8 bytes directly
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    import json
+
+    HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
-DEBUG = False
+
+# Index of previous results, kept in the output folder
+CACHE_FILENAME = "cache.json"
+# Part of every cache key; bump it whenever the extraction output changes
+# so that results cached by an older version are extracted again
+CACHE_VERSION = 2
+
+
+def _load_cache(cache_path: str) -> dict:
+    """Load the result cache, or return an empty one if it is missing or broken."""
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        cache = orjson.loads(data) if HAS_ORJSON else json.loads(data)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable cache %s: %s", cache_path, str(e))
+        return {}
+    if not isinstance(cache, dict):
+        logger.warning("Ignoring malformed cache %s", cache_path)
+        return {}
+    # Entries of any other shape are dropped, their documents are extracted again
+    return {
+        filename: cached
+        for filename, cached in cache.items()
+        if isinstance(cached, dict)
+        and "key" in cached
+        and isinstance(cached.get("result"), dict)
+        and ESSAY_TEXT_KEY in cached["result"]
+        and COMMENTS_KEY in cached["result"]
+    }
+
+
+def _save_cache(cache_path: str, cache: dict):
+    """Write the result cache atomically, so an interrupted run cannot corrupt it."""
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp_path = f"{cache_path}.tmp"
+    if HAS_ORJSON:
+        data = orjson.dumps(cache)
+    else:
+        data = json.dumps(cache, ensure_ascii=False).encode("utf-8")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, cache_path)
+
+
+def _cache_key(entry: os.DirEntry, config: ExtractConfig) -> dict:
+    """Describe the input file and the settings a cached result was produced with."""
+    st = entry.stat()
+    return {
+        "version": CACHE_VERSION,
+        "path": os.path.abspath(entry.path),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "config": [getattr(config, name) for name in ExtractConfig.__slots__],
+    }
 
 
 def process_folder(
@@ -17,23 +84,69 @@ def process_folder(
 
     extractor = CommentExtractor(config)
 
-    for idx, filename in enumerate(os.listdir(input_folder)):
-        if filename.endswith(".docx") and not filename.startswith("~$"):
-            input_path = os.path.join(input_folder, filename)
-            logger.info("Processing %s", filename)
+    # DirEntry caches the file type and stat result of each listed file
+    with os.scandir(input_folder) as it:
+        entries = [
+            entry
+            for entry in it
+            if entry.name.endswith(".docx")
+            and not entry.name.startswith("~$")
+            and entry.is_file()
+        ]
+
+    # Reuse results of documents unchanged since the previous run
+    cache_path = os.path.join(output_folder, CACHE_FILENAME)
+    cache = _load_cache(cache_path)
+    keys = {}
+    cached_results = {}
+    for entry in entries:
+        key = _cache_key(entry, config)
+        keys[entry.name] = key
+        cached = cache.get(entry.name)
+        if cached is not None and cached["key"] == key:
+            cached_results[entry.name] = cached["result"]
+    input_paths = [entry.path for entry in entries if entry.name not in cached_results]
 
-            result = extractor.process_document(input_path)
-            comments = result["comments"]
-            logger.info("There are %s comments in %s", len(comments), filename)
+    # Documents are extracted in parallel worker processes, results arrive in order
+    results = extractor.process_documents(input_paths)
+    for entry in entries:
+        filename = entry.name
+        logger.info("Processing %s", filename)
 
-            if result:
-                # Save output in each requested format
-                for fmt, formatter in formatters.items():
-                    output_path = formatter.save(result, output_folder, filename)
-                    logger.info("Generated %s: %s", fmt.upper(), output_path)
+        result = cached_results.get(filename)
+        if result is None:
+            _, result = next(results)
+            if result[ESSAY_TEXT_KEY] is not None:
+                cache[filename] = {"key": keys[filename], "result": result}
+        else:
+            logger.info("Using cached result for %s", filename)
 
-            if DEBUG:
-                break
+        comments = result["comments"]
+        logger.info("There are %s comments in %s", len(comments), filename)
+
+        if result:
+            # Save output in each requested format
+            for fmt, formatter in formatters.items():
+                if not formatter.has_output(result):
+                    # A file left by an earlier run would still show the old comments
+                    stale_path = formatter.get_output_path(output_folder, filename)
+                    try:
+                        os.remove(stale_path)
+                        logger.info("Removed stale %s: %s", fmt.upper(), stale_path)
+                    except FileNotFoundError:
+                        pass
+                    logger.info(
+                        "Skipped %s for %s, nothing to write", fmt.upper(), filename
+                    )
+                    continue
+                output_path = formatter.save(result, output_folder, filename)
+                logger.info("Generated %s: %s", fmt.upper(), output_path)
+
+    # Forget documents that are no longer in the input folder
+    _save_cache(
+        cache_path,
+        {filename: cache[filename] for filename in keys if filename in cache},
+    )
 
 
 def main():
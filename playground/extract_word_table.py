@@ -1,23 +1,68 @@
 import json
 import logging
-from docx.api import Document
+import os
+import sys
+import zipfile
+from xml.etree import ElementTree
+
+# Let the script import the repository modules when run from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from comment_extractor import TAG_BODY, TAG_TBL, extract_table_rows
 
 logger = logging.getLogger(__name__)
 
 input_file = "data/input/samples/sample 1.docx"
 
 
+def _first_table(input_file: str):
+    """
+    Stream document.xml and return the first table placed directly in the
+    body, or None. Everything read before that table is dropped on the way.
+    """
+    with zipfile.ZipFile(input_file) as zip_ref:
+        with zip_ref.open("word/document.xml") as doc_stream:
+            depth = 0
+            body = None
+            body_depth = 0
+            table = None
+            for event, elem in ElementTree.iterparse(
+                doc_stream, events=("start", "end")
+            ):
+                if event == "start":
+                    depth += 1
+                    if elem.tag == TAG_BODY:
+                        body = elem
+                        body_depth = depth
+                    elif (
+                        table is None
+                        and elem.tag == TAG_TBL
+                        and body is not None
+                        and depth == body_depth + 1
+                    ):
+                        table = elem
+                    continue
+                if elem is table:
+                    return table
+                if table is None:
+                    if body is not None and depth == body_depth + 1:
+                        body.remove(elem)
+                    else:
+                        elem.clear()
+                depth -= 1
+    return None
+
+
 def extract_table(input_file: str):
     data = []
 
-    document = Document(input_file)
-    if len(document.tables) == 0:
+    table = _first_table(input_file)
+    if table is None:
         logger.error("No table found in the document")
         return data
-    table = document.tables[0]
     keys = None
-    for i, row in enumerate(table.rows):
-        text = (cell.text.strip() for cell in row.cells)
+    for i, row in enumerate(extract_table_rows(table)):
+        text = (cell.strip() for cell in row)
 
         if i == 0:
             keys = tuple(text)
@@ -35,4 +80,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()